@@ -68,43 +68,60 @@ pub fn order_tasks(
             )
         });
 
-    // Perform post order traversal of the tasks and their `depends_on` to make sure they are
-    // executed in the right order.
-    let mut s1 = VecDeque::new();
-    let mut s2 = VecDeque::new();
-    let mut added = HashSet::new();
-
-    // Add the command specified on the command line first
-    s1.push_back((task, additional_args));
-    if let Some(task_name) = task_name {
-        added.insert(task_name);
+    // A task without dependencies is the only task to run, no need to traverse anything.
+    if task.depends_on().is_empty() {
+        return Ok(VecDeque::from([(task, additional_args)]));
     }
 
-    while let Some((task, additional_args)) = s1.pop_back() {
-        // Get the dependencies of the command
-        let depends_on = match &task {
-            Task::Execute(process) => process.depends_on.as_slice(),
-            Task::Alias(alias) => &alias.depends_on,
-            _ => &[],
-        };
+    // Perform a depth-first post-order traversal of the tasks and their `depends_on`. Dependencies
+    // are visited in the order in which they are declared and a task is only added after all the
+    // tasks it depends on, so the tasks are executed in the right order.
+    let mut ordered = Vec::new();
+    let mut visited = HashSet::new();
+    let mut in_progress = Vec::from_iter(task_name);
+    add_dependencies(&task, project, &mut in_progress, &mut visited, &mut ordered)?;
+    ordered.push((task, additional_args));
+
+    // The tasks are popped from the back when executed, so the first task to run goes last.
+    Ok(ordered.into_iter().rev().collect())
+}
 
-        // Locate the dependencies in the project and add them to the stack
-        for dependency in depends_on.iter() {
-            if !added.contains(dependency) {
-                let cmd = project
-                    .task_opt(dependency)
-                    .ok_or_else(|| miette::miette!("failed to find dependency {}", dependency))?
-                    .clone();
-
-                s1.push_back((cmd, Vec::new()));
-                added.insert(dependency.clone());
-            }
+/// Recursively adds the dependencies of `task` to `ordered`, each one after its own dependencies.
+/// `in_progress` holds the chain of tasks currently being visited and is used to detect cycles.
+fn add_dependencies(
+    task: &Task,
+    project: &Project,
+    in_progress: &mut Vec<String>,
+    visited: &mut HashSet<String>,
+    ordered: &mut Vec<(Task, Vec<String>)>,
+) -> miette::Result<()> {
+    for dependency in task.depends_on() {
+        if visited.contains(dependency) {
+            continue;
         }
 
-        s2.push_back((task, additional_args))
+        if let Some(pos) = in_progress.iter().position(|name| name == dependency) {
+            miette::bail!(
+                "cyclic dependency detected between tasks: {} -> {}",
+                in_progress[pos..].join(" -> "),
+                dependency
+            );
+        }
+
+        let cmd = project
+            .task_opt(dependency)
+            .ok_or_else(|| miette::miette!("failed to find dependency {}", dependency))?
+            .clone();
+
+        in_progress.push(dependency.clone());
+        add_dependencies(&cmd, project, in_progress, visited, ordered)?;
+        in_progress.pop();
+
+        visited.insert(dependency.clone());
+        ordered.push((cmd, Vec::new()));
     }
 
-    Ok(s2)
+    Ok(())
 }
 
 pub async fn create_script(task: Task, args: Vec<String>) -> miette::Result<SequentialList> {
@@ -262,3 +279,119 @@ async fn run_activation(prefix: Prefix) -> miette::Result<HashMap<String, String
 
     Ok(activator_result)
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::path::Path;
+
+    const PROJECT_BOILERPLATE: &str = r#"
+        [project]
+        name = "foo"
+        version = "0.1.0"
+        channels = []
+        platforms = []
+        "#;
+
+    /// Returns the commands of the ordered tasks in the order in which they are executed.
+    fn ordered_commands(manifest: &str, task: &str) -> miette::Result<Vec<String>> {
+        let project =
+            Project::from_manifest_str(Path::new(""), format!("{PROJECT_BOILERPLATE}\n{manifest}"))
+                .unwrap();
+        Ok(order_tasks(vec![task.to_string()], &project)?
+            .into_iter()
+            .rev()
+            .map(|(task, _)| match task {
+                Task::Plain(cmd)
+                | Task::Execute(Execute {
+                    cmd: CmdArgs::Single(cmd),
+                    ..
+                }) => cmd,
+                _ => String::from("alias"),
+            })
+            .collect())
+    }
+
+    #[test]
+    fn test_order_tasks_no_dependencies() {
+        let manifest = r#"
+        [tasks]
+        test = "echo test"
+        "#;
+
+        assert_eq!(ordered_commands(manifest, "test").unwrap(), ["echo test"]);
+    }
+
+    #[test]
+    fn test_order_tasks_diamond() {
+        let manifest = r#"
+        [tasks]
+        root = "echo root"
+        left = { cmd = "echo left", depends_on = ["root"] }
+        right = { cmd = "echo right", depends_on = ["root"] }
+        top = { cmd = "echo top", depends_on = ["left", "root", "right"] }
+        "#;
+
+        assert_eq!(
+            ordered_commands(manifest, "top").unwrap(),
+            ["echo root", "echo left", "echo right", "echo top"]
+        );
+    }
+
+    #[test]
+    fn test_order_tasks_dependency_of_sibling() {
+        // `b` depends on `c`, so `c` has to run before `b` even though `a` lists `b` first.
+        let manifest = r#"
+        [tasks]
+        c = "echo c"
+        b = { cmd = "echo b", depends_on = ["c"] }
+        a = { cmd = "echo a", depends_on = ["b", "c"] }
+        "#;
+
+        assert_eq!(
+            ordered_commands(manifest, "a").unwrap(),
+            ["echo c", "echo b", "echo a"]
+        );
+    }
+
+    #[test]
+    fn test_order_tasks_keeps_declaration_order() {
+        // `build` has its own dependency, it should still run before `lint` because it is listed
+        // first.
+        let manifest = r#"
+        [tasks]
+        configure = "echo configure"
+        build = { cmd = "echo build", depends_on = ["configure"] }
+        lint = "echo lint"
+        ci = { cmd = "echo ci", depends_on = ["build", "lint"] }
+        "#;
+
+        assert_eq!(
+            ordered_commands(manifest, "ci").unwrap(),
+            ["echo configure", "echo build", "echo lint", "echo ci"]
+        );
+    }
+
+    #[test]
+    fn test_order_tasks_cycle() {
+        let manifest = r#"
+        [tasks]
+        a = { cmd = "echo a", depends_on = ["b"] }
+        b = { cmd = "echo b", depends_on = ["a"] }
+        "#;
+
+        let err = ordered_commands(manifest, "a").unwrap_err();
+        assert!(err.to_string().contains("cyclic dependency detected"));
+    }
+
+    #[test]
+    fn test_order_tasks_self_dependency() {
+        let manifest = r#"
+        [tasks]
+        a = { cmd = "echo a", depends_on = ["a"] }
+        "#;
+
+        let err = ordered_commands(manifest, "a").unwrap_err();
+        assert!(err.to_string().contains("cyclic dependency detected"));
+    }
+}